@@ -182,15 +182,23 @@ class FusedScaleMaskSoftmax(nn.Module):
             return ScaledMaskedSoftmax.apply(input, mask, scale)
 
     def forward_torch_softmax(self, input, mask):
-        if self.input_in_float16 and self.softmax_in_fp32:
-            input = input.float()
+        upcast = self.input_in_float16 and self.softmax_in_fp32
 
         if self.scale is not None:
-            input = input * self.scale
+            # scaling has to happen in fp32 (see the assert in __init__). The upcast makes a
+            # fresh copy, so it can be scaled in place.
+            input = input.float().mul_(self.scale) if upcast else input * self.scale
+            upcast_in_softmax = False
+        else:
+            # without scaling, the upcast is left to the softmax kernel so that no
+            # fp32 copy of the [b, np, sq, sk] scores is materialized beforehand.
+            upcast_in_softmax = upcast
         mask_output = self.mask_func(input, mask) if mask is not None else input
-        probs = torch.nn.Softmax(dim=-1)(mask_output)
+        probs = torch.nn.functional.softmax(
+            mask_output, dim=-1, dtype=torch.float32 if upcast_in_softmax else None
+        )
 
-        if self.input_in_float16 and self.softmax_in_fp32:
+        if upcast:
             if self.input_in_fp16:
                 probs = probs.half()
             else:
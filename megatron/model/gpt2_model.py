@@ -45,7 +45,7 @@ from typing import Union, List
 
 
 def gpt2_attention_mask_func(attention_scores, ltor_mask):
-    attention_scores.masked_fill_(ltor_mask, -10000.0)
+    attention_scores.masked_fill_(ltor_mask, float("-inf"))
     return attention_scores
 
 
@@ -64,25 +64,27 @@ def cross_entropy(output, labels, _fp16=False):
         assert output.dtype == torch.half and loss_mask.dtype == torch.half
         losses = mpu.vocab_parallel_cross_entropy(output.contiguous(), labels)
     else:
-        losses = mpu.vocab_parallel_cross_entropy(output.float().contiguous(), labels)
+        losses = mpu.vocab_parallel_cross_entropy(
+            output.contiguous(), labels, dtype=torch.float
+        )
     loss_mask = loss_mask.view(-1)
-    loss = torch.sum(losses.view(-1) * loss_mask) / loss_mask.sum()
+    # dot fuses the masking multiply into the reduction, so no [s*b] intermediate is materialized
+    loss = torch.dot(losses.view(-1), loss_mask.type_as(losses)) / loss_mask.sum()
     return loss
 
 
 def _pre_transformer_block(args):
     # data format change for hidden_states to avoid explicit tranposes : [b s h] --> [s b h]
     assert len(args) == 2, "Incorrect number of arguments to _pre_transformer_block"
-    fn = lambda _args: (_args[0].transpose(0, 1).contiguous(), *_args[1:])
-    return fn(args)
+    hidden_states, attention_mask = args
+    return hidden_states.transpose(0, 1).contiguous(), attention_mask
 
 
 def _post_transformer_block(args):
     # from (hidden_states, attention_mask)
     # to (hidden_states.T)
     assert len(args) == 2, "Incorrect number of arguments to _post_transformer_block"
-    fn = lambda _args: (_args[0].transpose(0, 1).contiguous())
-    return fn(args)
+    return args[0].transpose(0, 1).contiguous()
 
 
 class GPT2ModelPipe(PipelineModule, torch.nn.Module):
@@ -348,9 +350,10 @@ class GPT2ModelPipe(PipelineModule, torch.nn.Module):
         for n, spec in enumerate(self.specs):
             if isinstance(spec, TiedLayerSpec):
                 if spec.key in tied_layers:
-                    # receiver
+                    # receiver - bind the owner module now, a closure over `spec` would
+                    # late-bind to whatever spec the loop ended on
                     layers.append(
-                        Lambda(lambda x: spec.forward_fn(tied_layers[spec.key][0], x))
+                        Lambda(partial(spec.forward_fn, tied_layers[spec.key][0]))
                     )
                 else:
                     # owner
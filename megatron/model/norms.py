@@ -16,21 +16,6 @@ import torch
 from torch.nn import LayerNorm as LayerNorm
 
 
-def get_norm(neox_args):
-    if neox_args.norm == "rmsnorm":
-        norm = RMSNorm
-        eps = neox_args.rms_norm_epsilon
-    elif neox_args.norm == "layernorm":
-        eps = neox_args.layernorm_epsilon
-        norm = LayerNorm
-    elif neox_args.norm == "scalenorm":
-        eps = neox_args.scalenorm_epsilon
-        norm = ScaleNorm
-    else:
-        raise ValueError(f"norm {neox_args.norm} not recognized")
-    return norm, eps
-
-
 class RMSNorm(torch.nn.Module):
     def __init__(self, dim, p=-1.0, eps=1e-8, bias=False):
         """
@@ -70,7 +55,7 @@ class RMSNorm(torch.nn.Module):
         x_normed = x / (rms_x + self.eps)
 
         if self.bias:
-            return self.scale * x_normed + self.offset
+            return torch.addcmul(self.offset, self.scale, x_normed)
 
         return self.scale * x_normed
 
@@ -84,3 +69,19 @@ class ScaleNorm(torch.nn.Module):
     def forward(self, x):
         n = torch.norm(x, dim=-1, keepdim=True).clamp(min=self.eps)
         return x / n * self.g
+
+
+# maps neox_args.norm to the norm class and the name of its epsilon argument
+_NORM_TABLE = {
+    "rmsnorm": (RMSNorm, "rms_norm_epsilon"),
+    "layernorm": (LayerNorm, "layernorm_epsilon"),
+    "scalenorm": (ScaleNorm, "scalenorm_epsilon"),
+}
+
+
+def get_norm(neox_args):
+    try:
+        norm, eps_attr = _NORM_TABLE[neox_args.norm]
+    except KeyError:
+        raise ValueError(f"norm {neox_args.norm} not recognized")
+    return norm, getattr(neox_args, eps_attr)
@@ -26,7 +26,7 @@ from .utils import VocabUtility
 
 class _VocabParallelCrossEntropy(torch.autograd.Function):
     @staticmethod
-    def forward(ctx, vocab_parallel_logits, target):
+    def forward(ctx, vocab_parallel_logits, target, dtype=None):
 
         # Maximum value along vocab dimension across all GPUs.
         logits_max = torch.max(vocab_parallel_logits, dim=-1)[0]
@@ -36,7 +36,15 @@ class _VocabParallelCrossEntropy(torch.autograd.Function):
             group=get_model_parallel_group(),
         )
         # Subtract the maximum value.
-        vocab_parallel_logits.sub_(logits_max.unsqueeze(dim=-1))
+        ctx.input_dtype = vocab_parallel_logits.dtype
+        if dtype is None or dtype == vocab_parallel_logits.dtype:
+            vocab_parallel_logits.sub_(logits_max.unsqueeze(dim=-1))
+        else:
+            # Upcast as part of the subtraction, rather than materializing
+            # a full-precision copy of the logits beforehand.
+            vocab_parallel_logits = torch.sub(
+                vocab_parallel_logits, logits_max.to(dtype).unsqueeze(dim=-1)
+            )
 
         # Get the partition's vocab indices
         get_vocab_range = VocabUtility.vocab_range_from_per_partition_vocab_size
@@ -109,9 +117,13 @@ class _VocabParallelCrossEntropy(torch.autograd.Function):
         # Finally elementwise multiplication with the output gradients.
         grad_input.mul_(grad_output.unsqueeze(dim=-1))
 
-        return grad_input, None
+        return grad_input.to(ctx.input_dtype), None, None
 
 
-def vocab_parallel_cross_entropy(vocab_parallel_logits, target):
-    """Helper function for the cross entropy."""
-    return _VocabParallelCrossEntropy.apply(vocab_parallel_logits, target)
+def vocab_parallel_cross_entropy(vocab_parallel_logits, target, dtype=None):
+    """Helper function for the cross entropy.
+
+    If `dtype` is given and differs from the dtype of the logits, the loss is
+    computed in `dtype` without modifying the logits in place.
+    """
+    return _VocabParallelCrossEntropy.apply(vocab_parallel_logits, target, dtype)